@@ -1,13 +1,54 @@
 #!/usr/bin/env node
 import fs from "fs";
+import os from "os";
 import path from "path";
+import http from "http";
 import https from "https";
-import { spawn, spawnSync } from "child_process";
+import net from "net";
+import { spawn } from "child_process";
 
 const GITHUB_API_HOST = "api.github.com";
+const GIT_CONCURRENCY = Math.min(32, os.cpus().length * 4);
+const FETCH_CONCURRENCY = 8;
+const GRAPHQL_BATCH_SIZE = 50;
+const COLORS = {
+  reset: "\x1b[0m",
+  bold: "\x1b[1m",
+  white: "\x1b[37m",
+  cyan: "\x1b[36m",
+  red: "\x1b[31m",
+  yellow: "\x1b[33m",
+  darkMagenta: "\x1b[35m",
+  brightRed: "\x1b[91m",
+};
+const NO_COLORS = Object.fromEntries(
+  Object.keys(COLORS).map((key) => [key, ""])
+) as typeof COLORS;
+const githubAgent = new https.Agent({ keepAlive: true, maxSockets: FETCH_CONCURRENCY });
+const CACHE_TTL_SECONDS = 300;
+const DAEMON_CONNECT_TIMEOUT_MS = 300;
+const DAEMON_REPLY_TIMEOUT_MS = 2000;
+const DAEMON_HEARTBEAT_MS = 500;
+const DAY_SECONDS = 24 * 60 * 60;
+const RELATIVE_TIME_BUCKETS: Array<[number, number, string, string]> = [
+  [60 * 60, 60, "min", "min"],
+  [DAY_SECONDS, 60 * 60, "hr", "hr"],
+  [7 * DAY_SECONDS, DAY_SECONDS, "day", "days"],
+  [35 * DAY_SECONDS, 7 * DAY_SECONDS, "wk", "wk"],
+  [360 * DAY_SECONDS, 30 * DAY_SECONDS, "mo", "mo"],
+  [Infinity, 365 * DAY_SECONDS, "yr", "yr"],
+];
+const REPO_INFO_FRAGMENT =
+  "fragment RepoInfo on Repository {" +
+  " stargazerCount" +
+  " pushedAt" +
+  " issues(states:OPEN) { totalCount }" +
+  " pullRequests(states:OPEN) { totalCount }" +
+  " latestRelease { tagName createdAt }" +
+  "}";
 
 type RepoInfo = {
-  activity: string;
+  activityAt: string | null;
   issues: number;
   prs: number;
   stars: number;
@@ -15,69 +56,175 @@ type RepoInfo = {
   releaseDate: string;
 };
 
-type RepoResult = RepoInfo & { repo: string };
+type RepoResult = RepoInfo & { repo: string; activity: string };
+
+type Transport = (
+  options: https.RequestOptions,
+  callback: (res: http.IncomingMessage) => void
+) => http.ClientRequest;
+
+type ResponseCache = Record<string, { etag: string; body: unknown }>;
+
+type RepoCache = Record<
+  string,
+  { fetchedAt: number; data: RepoInfo; responses?: ResponseCache }
+>;
+
+type RepoRef = { owner: string; name: string };
+
+type GraphqlRepository = {
+  stargazerCount: number;
+  pushedAt: string | null;
+  issues: { totalCount: number };
+  pullRequests: { totalCount: number };
+  latestRelease: { tagName: string; createdAt: string } | null;
+};
+
+type Column = {
+  header: string;
+  align: "left" | "right";
+  value: (item: RepoResult) => string;
+  color: (item: RepoResult, colors: typeof COLORS) => string;
+};
+
+type ScanRequest = { root: string; recursive: boolean; refresh: boolean; token?: string };
+
+type ScanReport = { repoCount: number; results: RepoResult[]; errors: string[] };
 
 type Args = {
   root: string;
   recursive: boolean;
   noColor: boolean;
+  noCache: boolean;
+  refresh: boolean;
+  daemon: boolean;
   help?: boolean;
 };
 
-function runGit(args: string[], repoPath: string): string | null {
-  const result = spawnSync("git", ["-C", repoPath, ...args], {
-    encoding: "utf8",
-  });
-  if (result.status !== 0) {
+async function runGit(args: string[], repoPath: string): Promise<string | null> {
+  try {
+    const { stdout } = await runCommand("git", ["-C", repoPath, ...args]);
+    return stdout.trim();
+  } catch {
     return null;
   }
-  return result.stdout.trim();
 }
 
-function ghAvailable(): boolean {
-  const result = spawnSync("gh", ["--version"], { encoding: "utf8" });
-  return result.status === 0;
+function parseRemoteOriginUrl(config: string): string | null {
+  let inOrigin = false;
+  let url: string | null = null;
+  for (const rawLine of config.split(/\r?\n/)) {
+    const line = rawLine.trim();
+    if (line.startsWith("[")) {
+      const section = /^\[(\S+)\s+"(.*)"\]$/.exec(line);
+      inOrigin = section?.[1].toLowerCase() === "remote" && section[2] === "origin";
+      continue;
+    }
+    const match = inOrigin ? /^url\s*=\s*(.*)$/i.exec(line) : null;
+    if (match) {
+      url = match[1].trim().replace(/^"(.*)"$/, "$1");
+    }
+  }
+  return url;
+}
+
+async function gitConfigPath(repoPath: string): Promise<string> {
+  const dotGit = path.join(repoPath, ".git");
+  const stat = await fs.promises.stat(dotGit);
+  if (stat.isDirectory()) {
+    return path.join(dotGit, "config");
+  }
+  const gitFile = await fs.promises.readFile(dotGit, "utf8");
+  const match = /^gitdir:\s*(.+)$/m.exec(gitFile);
+  if (!match) {
+    throw new Error(`invalid gitfile: ${dotGit}`);
+  }
+  const gitDir = path.resolve(repoPath, match[1].trim());
+  const commonDir = await fs.promises.readFile(path.join(gitDir, "commondir"), "utf8").then(
+    (value) => path.resolve(gitDir, value.trim()),
+    () => gitDir
+  );
+  return path.join(commonDir, "config");
+}
+
+export async function readRemoteOriginUrl(repoPath: string): Promise<string | null> {
+  const config = await gitConfigPath(repoPath)
+    .then((configPath) => fs.promises.readFile(configPath, "utf8"))
+    .catch(() => null);
+  if (config !== null && !/^\s*\[include(If)?[\s\]]/im.test(config)) {
+    return parseRemoteOriginUrl(config);
+  }
+  return runGit(["config", "--get", "remote.origin.url"], repoPath);
+}
+
+async function mapWithConcurrency<T, R>(
+  items: T[],
+  limit: number,
+  fn: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+  const results = new Array<R>(items.length);
+  let next = 0;
+  const worker = async () => {
+    while (next < items.length) {
+      const index = next;
+      next += 1;
+      results[index] = await fn(items[index], index);
+    }
+  };
+  const workers = Math.max(1, Math.min(limit, items.length));
+  await Promise.all(Array.from({ length: workers }, worker));
+  return results;
+}
+
+function pathExists(target: string): Promise<boolean> {
+  return fs.promises.lstat(target).then(
+    () => true,
+    () => false
+  );
 }
 
-function findRepos(root: string, recursive: boolean): string[] {
+export async function findRepos(root: string, recursive: boolean): Promise<string[]> {
   const repos: string[] = [];
-  const stat = fs.statSync(root, { throwIfNoEntry: false });
-  if (!stat || !stat.isDirectory()) {
+  let rootEntries: fs.Dirent[];
+  try {
+    rootEntries = await fs.promises.readdir(root, { withFileTypes: true });
+  } catch {
     return repos;
   }
+  const childDirs = (current: string, entries: fs.Dirent[]) =>
+    entries.filter((entry) => entry.isDirectory()).map((entry) => path.join(current, entry.name));
+
   if (!recursive) {
-    const entries = fs.readdirSync(root, { withFileTypes: true });
-    for (const entry of entries) {
-      if (!entry.isDirectory()) {
-        continue;
-      }
-      const candidate = path.join(root, entry.name);
-      if (fs.existsSync(path.join(candidate, ".git"))) {
-        repos.push(candidate);
-      }
-    }
+    await Promise.all(
+      childDirs(root, rootEntries).map(async (candidate) => {
+        if (
+          (await pathExists(path.join(candidate, ".git"))) &&
+          !(await pathExists(path.join(candidate, ".nogit")))
+        ) {
+          repos.push(candidate);
+        }
+      })
+    );
     return repos;
   }
 
-  const stack = [root];
-  while (stack.length) {
-    const current = stack.pop();
-    if (!current) {
-      continue;
+  const visit = async (current: string): Promise<void> => {
+    let entries: fs.Dirent[];
+    try {
+      entries = await fs.promises.readdir(current, { withFileTypes: true });
+    } catch {
+      return;
     }
-    const entries = fs.readdirSync(current, { withFileTypes: true });
-    for (const entry of entries) {
-      if (!entry.isDirectory()) {
-        continue;
-      }
-      const candidate = path.join(current, entry.name);
-      if (fs.existsSync(path.join(candidate, ".git"))) {
-        repos.push(candidate);
-        continue;
-      }
-      stack.push(candidate);
+    if (entries.some((entry) => entry.name === ".nogit")) {
+      return;
     }
-  }
+    if (entries.some((entry) => entry.name === ".git")) {
+      repos.push(current);
+      return;
+    }
+    await Promise.all(childDirs(current, entries).map(visit));
+  };
+  await Promise.all(childDirs(root, rootEntries).map(visit));
   return repos;
 }
 
@@ -107,60 +254,67 @@ export function parseGithubOwnerRepo(
   return { owner, name };
 }
 
-export function formatRelativeTime(isoTime: string | null): string {
+export function formatRelativeTime(isoTime: string | null, now = Date.now()): string {
   if (!isoTime) {
     return "-";
   }
-  const timestamp = new Date(isoTime).getTime();
+  const timestamp = Date.parse(isoTime);
   if (Number.isNaN(timestamp)) {
     return "-";
   }
-  const now = Date.now();
   const deltaSeconds = Math.floor((now - timestamp) / 1000);
-  if (deltaSeconds < 60) {
-    return "1 min ago";
-  }
-  const minutes = Math.floor(deltaSeconds / 60);
-  if (minutes < 60) {
-    return `${minutes} min ago`;
-  }
-  const hours = Math.floor(minutes / 60);
-  if (hours < 24) {
-    return `${hours} hr ago`;
-  }
-  const days = Math.floor(hours / 24);
-  if (days < 7) {
-    return days === 1 ? "1 day ago" : `${days} days ago`;
-  }
-  const weeks = Math.floor(days / 7);
-  if (weeks < 5) {
-    return `${weeks} wk ago`;
+  for (const [limit, unit, singular, plural] of RELATIVE_TIME_BUCKETS) {
+    if (deltaSeconds < limit) {
+      const count = Math.max(1, Math.floor(deltaSeconds / unit));
+      return `${count} ${count === 1 ? singular : plural} ago`;
+    }
   }
-  const months = Math.floor(days / 30);
-  if (months < 12) {
-    return `${months} mo ago`;
+  return "-";
+}
+
+let githubTokenPromise: Promise<string | null> | null = null;
+
+function githubToken(refresh = false): Promise<string | null> {
+  if (refresh || !githubTokenPromise) {
+    const pending = resolveGithubToken().then((token) => {
+      if (!token && githubTokenPromise === pending) {
+        githubTokenPromise = null;
+      }
+      return token;
+    });
+    githubTokenPromise = pending;
   }
-  const years = Math.floor(days / 365);
-  return `${years} yr ago`;
+  return githubTokenPromise;
 }
 
-function githubToken(): string | null {
-  return process.env.GITHUB_TOKEN || process.env.GH_TOKEN || null;
+async function resolveGithubToken(): Promise<string | null> {
+  const envToken = process.env.GITHUB_TOKEN || process.env.GH_TOKEN;
+  if (envToken) {
+    return envToken;
+  }
+  try {
+    const { stdout } = await runCommand("gh", ["auth", "token"]);
+    return stdout.trim() || null;
+  } catch {
+    return null;
+  }
 }
 
 function runCommand(command: string, args: string[]): Promise<{ stdout: string }> {
   return new Promise((resolve, reject) => {
     const child = spawn(command, args, { stdio: ["ignore", "pipe", "pipe"] });
-    let stdout = "";
-    let stderr = "";
-    child.stdout.on("data", (chunk) => {
-      stdout += chunk.toString();
+    const stdoutChunks: Buffer[] = [];
+    const stderrChunks: Buffer[] = [];
+    child.stdout.on("data", (chunk: Buffer) => {
+      stdoutChunks.push(chunk);
     });
-    child.stderr.on("data", (chunk) => {
-      stderr += chunk.toString();
+    child.stderr.on("data", (chunk: Buffer) => {
+      stderrChunks.push(chunk);
     });
     child.on("error", reject);
     child.on("close", (code) => {
+      const stdout = Buffer.concat(stdoutChunks).toString("utf8");
+      const stderr = Buffer.concat(stderrChunks).toString("utf8");
       if (code !== 0) {
         const message = stderr.trim() || `${command} failed`;
         reject(new Error(message));
@@ -171,119 +325,60 @@ function runCommand(command: string, args: string[]): Promise<{ stdout: string }
   });
 }
 
-async function ghGraphqlRepoInfo(owner: string, name: string): Promise<RepoInfo> {
-  const query =
-    "query($owner:String!, $name:String!) {" +
-    " repository(owner:$owner, name:$name) {" +
-    "  stargazerCount" +
-    "  issues(states:OPEN) { totalCount }" +
-    "  pullRequests(states:OPEN) { totalCount }" +
-    "  releases(first:1, orderBy:{field:CREATED_AT,direction:DESC}) {" +
-    "    nodes { tagName createdAt }" +
-    "  }" +
-    "  defaultBranchRef {" +
-    "    target {" +
-    "      __typename" +
-    "      ... on Commit { committedDate }" +
-    "      ... on Tag {" +
-    "        target {" +
-    "          ... on Commit { committedDate }" +
-    "        }" +
-    "      }" +
-    "    }" +
-    "  }" +
-    " }" +
-    "}";
-
-  const { stdout } = await runCommand("gh", [
-    "api",
-    "graphql",
-    "-f",
-    `owner=${owner}`,
-    "-f",
-    `name=${name}`,
-    "-f",
-    `query=${query}`,
-  ]);
-  if (!stdout.trim()) {
-    throw new Error("gh api returned no output");
-  }
-  const data = JSON.parse(stdout) as {
-    data?: {
-      repository?: {
-        stargazerCount: number;
-        issues: { totalCount: number };
-        pullRequests: { totalCount: number };
-        releases: { nodes: Array<{ tagName: string; createdAt: string }> };
-        defaultBranchRef: {
-          target:
-            | { __typename: "Commit"; committedDate: string }
-            | { __typename: "Tag"; target: { committedDate: string } };
-        } | null;
-      };
-    };
-  };
-  const repoData = data.data?.repository;
-  if (!repoData) {
-    throw new Error("repository not found or access denied");
-  }
-
-  const releases = repoData.releases?.nodes || [];
-  const releaseTag = releases[0]?.tagName || "-";
-  const releaseDate = releases[0]?.createdAt
-    ? releases[0].createdAt.split("T", 1)[0]
-    : "-";
-
-  let committedAt: string | null = null;
-  const branch = repoData.defaultBranchRef;
-  if (branch?.target) {
-    const target = branch.target;
-    if (target.__typename === "Commit") {
-      committedAt = target.committedDate;
-    } else if (target.__typename === "Tag") {
-      committedAt = target.target?.committedDate || null;
-    }
-  }
+const githubTransport: Transport = (options, callback) =>
+  https.request({ agent: githubAgent, ...options }, callback);
 
-  return {
-    activity: formatRelativeTime(committedAt),
-    issues: repoData.issues.totalCount,
-    prs: repoData.pullRequests.totalCount,
-    stars: repoData.stargazerCount,
-    releaseTag,
-    releaseDate,
-  };
-}
-
-function requestJson<T>(
+export function requestJson<T>(
   options: https.RequestOptions,
-  body?: string
+  body?: string,
+  responses?: ResponseCache,
+  transport: Transport = githubTransport
 ): Promise<T | null> {
+  const cacheKey = options.path || "";
+  const cached = responses?.[cacheKey];
+  const headers = cached ? { ...options.headers, "If-None-Match": cached.etag } : options.headers;
   return new Promise((resolve, reject) => {
-    const req = https.request(options, (res) => {
-      let data = "";
-      res.setEncoding("utf8");
-      res.on("data", (chunk) => {
-        data += chunk;
+    const req = transport({ ...options, headers }, (res) => {
+      if (res.statusCode === 304 && cached) {
+        res.resume();
+        resolve(cached.body as T);
+        return;
+      }
+      if (res.statusCode === 404) {
+        res.resume();
+        if (responses) {
+          delete responses[cacheKey];
+        }
+        resolve(null);
+        return;
+      }
+      if (res.statusCode && res.statusCode >= 400) {
+        res.resume();
+        reject(new Error(`GitHub API error ${res.statusCode}`));
+        return;
+      }
+      const chunks: Buffer[] = [];
+      res.on("data", (chunk: Buffer) => {
+        chunks.push(chunk);
       });
       res.on("end", () => {
-        if (res.statusCode === 404) {
-          resolve(null);
-          return;
-        }
-        if (res.statusCode && res.statusCode >= 400) {
-          reject(new Error(`GitHub API error ${res.statusCode}`));
-          return;
-        }
+        const data = Buffer.concat(chunks).toString("utf8");
         if (!data.trim()) {
           resolve(null);
           return;
         }
+        let parsed: T;
         try {
-          resolve(JSON.parse(data) as T);
+          parsed = JSON.parse(data) as T;
         } catch (err) {
           reject(err);
+          return;
         }
+        const etag = res.headers.etag;
+        if (responses && etag) {
+          responses[cacheKey] = { etag, body: parsed };
+        }
+        resolve(parsed);
       });
     });
     req.on("error", reject);
@@ -294,53 +389,48 @@ function requestJson<T>(
   });
 }
 
-async function graphqlRepoInfo(
-  owner: string,
-  name: string,
-  token: string
-): Promise<RepoInfo> {
-  const query =
-    "query($owner:String!, $name:String!) {" +
-    " repository(owner:$owner, name:$name) {" +
-    "  stargazerCount" +
-    "  issues(states:OPEN) { totalCount }" +
-    "  pullRequests(states:OPEN) { totalCount }" +
-    "  releases(first:1, orderBy:{field:CREATED_AT,direction:DESC}) {" +
-    "    nodes { tagName createdAt }" +
-    "  }" +
-    "  defaultBranchRef {" +
-    "    target {" +
-    "      __typename" +
-    "      ... on Commit { committedDate }" +
-    "      ... on Tag {" +
-    "        target {" +
-    "          ... on Commit { committedDate }" +
-    "        }" +
-    "      }" +
-    "    }" +
-    "  }" +
-    " }" +
-    "}";
-
-  const body = JSON.stringify({
-    query,
-    variables: { owner, name },
+export function buildRepoInfoQuery(repos: RepoRef[]): {
+  query: string;
+  variables: Record<string, string>;
+} {
+  const params: string[] = [];
+  const fields: string[] = [];
+  const variables: Record<string, string> = {};
+  repos.forEach((repo, index) => {
+    params.push(`$owner${index}:String!, $name${index}:String!`);
+    fields.push(
+      ` r${index}: repository(owner:$owner${index}, name:$name${index}) { ...RepoInfo }`
+    );
+    variables[`owner${index}`] = repo.owner;
+    variables[`name${index}`] = repo.name;
   });
+  const query =
+    `query(${params.join(", ")}) {${fields.join("")} } ` + REPO_INFO_FRAGMENT;
+  return { query, variables };
+}
+
+function repoInfoFromGraphql(repoData: GraphqlRepository): RepoInfo {
+  const release = repoData.latestRelease;
+  return {
+    activityAt: repoData.pushedAt,
+    issues: repoData.issues.totalCount,
+    prs: repoData.pullRequests.totalCount,
+    stars: repoData.stargazerCount,
+    releaseTag: release?.tagName || "-",
+    releaseDate: release?.createdAt ? release.createdAt.split("T", 1)[0] : "-",
+  };
+}
+
+async function graphqlRepoInfos(
+  repos: RepoRef[],
+  token: string,
+  transport: Transport
+): Promise<Array<RepoInfo | Error>> {
+  const body = JSON.stringify(buildRepoInfoQuery(repos));
 
   const data = await requestJson<{
-    data?: {
-      repository?: {
-        stargazerCount: number;
-        issues: { totalCount: number };
-        pullRequests: { totalCount: number };
-        releases: { nodes: Array<{ tagName: string; createdAt: string }> };
-        defaultBranchRef: {
-          target:
-            | { __typename: "Commit"; committedDate: string }
-            | { __typename: "Tag"; target: { committedDate: string } };
-        } | null;
-      };
-    };
+    data?: Record<string, GraphqlRepository | null> | null;
+    errors?: Array<{ message: string; path?: string[] }>;
   }>(
     {
       method: "POST",
@@ -353,57 +443,54 @@ async function graphqlRepoInfo(
         Authorization: `Bearer ${token}`,
       },
     },
-    body
+    body,
+    undefined,
+    transport
   );
-  const repoData = data?.data?.repository;
-  if (!repoData) {
-    throw new Error("repository not found or access denied");
+  const repositories = data?.data;
+  if (!repositories) {
+    throw new Error(data?.errors?.[0]?.message || "GraphQL query returned no data");
   }
-  const releases = repoData.releases?.nodes || [];
-  const releaseTag = releases[0]?.tagName || "-";
-  const releaseDate = releases[0]?.createdAt
-    ? releases[0].createdAt.split("T", 1)[0]
-    : "-";
-
-  let committedAt: string | null = null;
-  const branch = repoData.defaultBranchRef;
-  if (branch?.target) {
-    const target = branch.target;
-    if (target.__typename === "Commit") {
-      committedAt = target.committedDate;
-    } else if (target.__typename === "Tag") {
-      committedAt = target.target?.committedDate || null;
+  const errors = data.errors || [];
+  return repos.map((_, index) => {
+    const alias = `r${index}`;
+    const repoData = repositories[alias];
+    if (!repoData) {
+      const error = errors.find((item) => item.path?.[0] === alias);
+      return new Error(error?.message || "repository not found or access denied");
     }
-  }
-
-  return {
-    activity: formatRelativeTime(committedAt),
-    issues: repoData.issues.totalCount,
-    prs: repoData.pullRequests.totalCount,
-    stars: repoData.stargazerCount,
-    releaseTag,
-    releaseDate,
-  };
+    return repoInfoFromGraphql(repoData);
+  });
 }
 
 async function restRepoInfo(
   owner: string,
   name: string,
-  token: string
+  token: string,
+  responses: ResponseCache,
+  transport: Transport
 ): Promise<RepoInfo> {
-  const repo = await requestJson<{
+  const get = <T>(requestPath: string) =>
+    requestJson<T>(
+      {
+        method: "GET",
+        host: GITHUB_API_HOST,
+        path: requestPath,
+        headers: {
+          "User-Agent": "ghg",
+          Accept: "application/vnd.github+json",
+          Authorization: `Bearer ${token}`,
+        },
+      },
+      undefined,
+      responses,
+      transport
+    );
+
+  const repo = await get<{
     pushed_at?: string;
     stargazers_count?: number;
-  }>({
-    method: "GET",
-    host: GITHUB_API_HOST,
-    path: `/repos/${owner}/${name}`,
-    headers: {
-      "User-Agent": "ghg",
-      Accept: "application/vnd.github+json",
-      Authorization: `Bearer ${token}`,
-    },
-  });
+  }>(`/repos/${owner}/${name}`);
   if (!repo) {
     throw new Error("repository not found or access denied");
   }
@@ -412,42 +499,17 @@ async function restRepoInfo(
     `repo:${owner}/${name} type:issue state:open`
   );
   const prsQuery = encodeURIComponent(`repo:${owner}/${name} type:pr state:open`);
-  const issuesResult = await requestJson<{ total_count?: number }>({
-    method: "GET",
-    host: GITHUB_API_HOST,
-    path: `/search/issues?q=${issuesQuery}`,
-    headers: {
-      "User-Agent": "ghg",
-      Accept: "application/vnd.github+json",
-      Authorization: `Bearer ${token}`,
-    },
-  });
-  const prsResult = await requestJson<{ total_count?: number }>({
-    method: "GET",
-    host: GITHUB_API_HOST,
-    path: `/search/issues?q=${prsQuery}`,
-    headers: {
-      "User-Agent": "ghg",
-      Accept: "application/vnd.github+json",
-      Authorization: `Bearer ${token}`,
-    },
-  });
+  const issuesResult = await get<{ total_count?: number }>(
+    `/search/issues?q=${issuesQuery}&per_page=1`
+  );
+  const prsResult = await get<{ total_count?: number }>(`/search/issues?q=${prsQuery}&per_page=1`);
 
-  const release = await requestJson<{ tag_name?: string; created_at?: string }>(
-    {
-      method: "GET",
-      host: GITHUB_API_HOST,
-      path: `/repos/${owner}/${name}/releases/latest`,
-      headers: {
-        "User-Agent": "ghg",
-        Accept: "application/vnd.github+json",
-        Authorization: `Bearer ${token}`,
-      },
-    }
+  const release = await get<{ tag_name?: string; created_at?: string }>(
+    `/repos/${owner}/${name}/releases/latest`
   );
 
   return {
-    activity: formatRelativeTime(repo.pushed_at || null),
+    activityAt: repo.pushed_at || null,
     issues: issuesResult?.total_count || 0,
     prs: prsResult?.total_count || 0,
     stars: repo.stargazers_count || 0,
@@ -458,11 +520,33 @@ async function restRepoInfo(
   };
 }
 
+function toError(err: unknown): Error {
+  return err instanceof Error ? err : new Error(String(err));
+}
+
+export async function fetchRepoInfos(
+  repos: RepoRef[],
+  token: string,
+  responsesFor: (repo: RepoRef) => ResponseCache,
+  transport: Transport = githubTransport
+): Promise<Array<RepoInfo | Error>> {
+  try {
+    return await graphqlRepoInfos(repos, token, transport);
+  } catch {
+    return mapWithConcurrency(repos, FETCH_CONCURRENCY, (repo) =>
+      restRepoInfo(repo.owner, repo.name, token, responsesFor(repo), transport).catch(toError)
+    );
+  }
+}
+
 function parseArgs(argv: string[]): Args {
   const args: Args = {
     root: ".",
     recursive: false,
     noColor: false,
+    noCache: false,
+    refresh: false,
+    daemon: false,
   };
   for (let i = 2; i < argv.length; i += 1) {
     const arg = argv[i];
@@ -473,6 +557,12 @@ function parseArgs(argv: string[]): Args {
       args.recursive = true;
     } else if (arg === "--no-color") {
       args.noColor = true;
+    } else if (arg === "--no-cache") {
+      args.noCache = true;
+    } else if (arg === "--refresh") {
+      args.refresh = true;
+    } else if (arg === "--daemon") {
+      args.daemon = true;
     } else if (arg === "--help" || arg === "-h") {
       args.help = true;
     }
@@ -502,6 +592,60 @@ export function loadConfigRoot(): string | null {
   return null;
 }
 
+function cachePath(): string {
+  return path.join(process.env.HOME || "", ".cache", "ghg", "repos.json");
+}
+
+export function cacheTtlMs(): number {
+  const ttl = process.env.GHG_TTL ? Number(process.env.GHG_TTL) : NaN;
+  return (Number.isFinite(ttl) && ttl >= 0 ? ttl : CACHE_TTL_SECONDS) * 1000;
+}
+
+export function staleTargets(
+  targets: RepoRef[],
+  cache: RepoCache,
+  now: number,
+  ttl: number,
+  refresh: boolean
+): RepoRef[] {
+  const stale = new Map<string, RepoRef>();
+  for (const target of targets) {
+    const key = `${target.owner}/${target.name}`;
+    const entry = cache[key];
+    if (refresh || !entry?.data || now - entry.fetchedAt > ttl) {
+      stale.set(key, target);
+    }
+  }
+  return [...stale.values()];
+}
+
+export function loadRepoCache(): RepoCache {
+  const file = cachePath();
+  try {
+    if (!fs.existsSync(file)) {
+      return {};
+    }
+    const data = JSON.parse(fs.readFileSync(file, "utf8")) as RepoCache;
+    return data && typeof data === "object" ? data : {};
+  } catch {
+    console.error(`Warning: failed to read cache: ${file}`);
+  }
+  return {};
+}
+
+export function saveRepoCache(cache: RepoCache): void {
+  const file = cachePath();
+  const tempFile = `${file}.${process.pid}.tmp`;
+  try {
+    fs.mkdirSync(path.dirname(file), { recursive: true });
+    fs.writeFileSync(tempFile, JSON.stringify(cache), "utf8");
+    fs.renameSync(tempFile, file);
+  } catch {
+    fs.rmSync(tempFile, { force: true });
+    console.error(`Warning: failed to write cache: ${file}`);
+  }
+}
+
 function printHelp(): void {
   console.log("ghg - list open issues/PRs across local GitHub repos");
   console.log("");
@@ -512,9 +656,19 @@ function printHelp(): void {
   console.log("  --root PATH     Root directory to scan (default: .)");
   console.log("  --recursive     Scan repositories recursively");
   console.log("  --no-color      Disable colored output");
+  console.log("  --no-cache      Do not read or write the local cache");
+  console.log("  --refresh       Ignore cached data and refetch everything");
+  console.log("  --daemon        Serve results from a long-running process");
   console.log("");
   console.log("Config:");
   console.log('  ~/.config/ghg/config.json with {"root":"/path"}');
+  console.log("");
+  console.log("Cache:");
+  console.log("  ~/.cache/ghg/repos.json, entries expire after GHG_TTL seconds (default: 300)");
+  console.log("");
+  console.log("Daemon:");
+  console.log("  Listens on $XDG_RUNTIME_DIR/ghg.sock (or ~/.cache/ghg/ghg.sock);");
+  console.log("  ghg uses it automatically when it is running");
 }
 
 function createSpinner(enabled: boolean) {
@@ -569,12 +723,324 @@ function createSpinner(enabled: boolean) {
   };
 }
 
+const COLUMNS: Column[] = [
+  {
+    header: "ACTIVITY",
+    align: "left",
+    value: (item) => item.activity,
+    color: (_item, colors) => colors.darkMagenta,
+  },
+  {
+    header: "ISSUES",
+    align: "right",
+    value: (item) => String(item.issues),
+    color: (item, colors) => (item.issues > 0 ? colors.red : colors.darkMagenta),
+  },
+  {
+    header: "PR",
+    align: "right",
+    value: (item) => String(item.prs),
+    color: (item, colors) => (item.prs > 0 ? colors.brightRed : colors.darkMagenta),
+  },
+  {
+    header: "STAR",
+    align: "right",
+    value: (item) => String(item.stars),
+    color: (item, colors) => (item.stars > 0 ? colors.yellow : colors.darkMagenta),
+  },
+  {
+    header: "REL",
+    align: "left",
+    value: (item) => item.releaseTag,
+    color: (item, colors) => (item.releaseTag !== "-" ? colors.white : colors.darkMagenta),
+  },
+  {
+    header: "RELEASED",
+    align: "left",
+    value: (item) => item.releaseDate,
+    color: (item, colors) => (item.releaseDate !== "-" ? colors.white : colors.darkMagenta),
+  },
+  {
+    header: "REPO",
+    align: "left",
+    value: (item) => item.repo,
+    color: (_item, colors) => colors.cyan,
+  },
+];
+
+export function renderTable(results: RepoResult[], useColor: boolean): string {
+  const colors = useColor ? COLORS : NO_COLORS;
+  const cells = results.map((item) => COLUMNS.map((column) => column.value(item)));
+  const widths = COLUMNS.map((column) => column.header.length);
+  for (const row of cells) {
+    row.forEach((cell, index) => {
+      widths[index] = Math.max(widths[index], cell.length);
+    });
+  }
+  const pad = (text: string, index: number) =>
+    COLUMNS[index].align === "right" ? text.padStart(widths[index]) : text.padEnd(widths[index]);
+
+  const header = COLUMNS.map((column, index) => pad(column.header, index)).join("  ");
+  const lines = [`${colors.bold}${colors.white}${header}${colors.reset}`];
+  results.forEach((item, rowIndex) => {
+    const line = COLUMNS.map(
+      (column, index) =>
+        `${column.color(item, colors)}${pad(cells[rowIndex][index], index)}${colors.reset}`
+    ).join("  ");
+    lines.push(line);
+  });
+  return `${lines.join("\n")}\n`;
+}
+
+async function scanRepos(
+  request: ScanRequest,
+  cache: RepoCache,
+  persist: boolean,
+  spinner: ReturnType<typeof createSpinner>,
+  ttl = cacheTtlMs()
+): Promise<ScanReport> {
+  const repos = (await findRepos(request.root, request.recursive)).sort();
+  if (!repos.length) {
+    return { repoCount: 0, results: [], errors: [] };
+  }
+
+  const report: ScanReport = { repoCount: repos.length, results: [], errors: [] };
+  spinner.start(`Scanning ${repos.length} repositories`);
+  const remotes = await mapWithConcurrency(repos, GIT_CONCURRENCY, readRemoteOriginUrl);
+  const targets = remotes
+    .map((remote) => parseGithubOwnerRepo(remote))
+    .filter((info): info is RepoRef => info !== null);
+
+  const fetchedAt = Date.now();
+  const pending = staleTargets(targets, cache, fetchedAt, ttl, request.refresh);
+
+  const errors = new Map<string, Error>();
+  const token = pending.length ? request.token || (await githubToken()) : null;
+  if (pending.length && !token) {
+    report.errors.push("GITHUB_TOKEN/GH_TOKEN not set and `gh auth token` failed");
+  }
+  if (pending.length && token) {
+    const responses = new Map<string, ResponseCache>();
+    const responsesFor = (repo: RepoRef): ResponseCache => {
+      const key = `${repo.owner}/${repo.name}`;
+      let repoResponses = responses.get(key);
+      if (!repoResponses) {
+        repoResponses = { ...cache[key]?.responses };
+        responses.set(key, repoResponses);
+      }
+      return repoResponses;
+    };
+
+    const batches: RepoRef[][] = [];
+    for (let i = 0; i < pending.length; i += GRAPHQL_BATCH_SIZE) {
+      batches.push(pending.slice(i, i + GRAPHQL_BATCH_SIZE));
+    }
+    let fetchedCount = 0;
+    spinner.update(`Fetching 0/${pending.length} repositories`);
+    const fetched = await mapWithConcurrency(batches, FETCH_CONCURRENCY, async (batch) => {
+      const infos = await fetchRepoInfos(batch, token, responsesFor);
+      fetchedCount += batch.length;
+      spinner.update(`Fetching ${fetchedCount}/${pending.length} repositories`);
+      return infos;
+    });
+    fetched.flat().forEach((repoInfo, index) => {
+      const key = `${pending[index].owner}/${pending[index].name}`;
+      if (repoInfo instanceof Error) {
+        errors.set(key, repoInfo);
+        return;
+      }
+      cache[key] = {
+        fetchedAt,
+        data: repoInfo,
+        responses: responses.get(key) || cache[key]?.responses,
+      };
+    });
+    if (persist) {
+      saveRepoCache(cache);
+    }
+  }
+  spinner.stop();
+
+  for (const target of targets) {
+    const repo = `${target.owner}/${target.name}`;
+    const error = errors.get(repo);
+    if (error) {
+      report.errors.push(`${repo}: ${error.message}`);
+      continue;
+    }
+    const entry = cache[repo];
+    if (!entry) {
+      continue;
+    }
+    const repoInfo = entry.data;
+    report.results.push({
+      repo,
+      activity: formatRelativeTime(repoInfo.activityAt, fetchedAt),
+      ...repoInfo,
+    });
+  }
+  return report;
+}
+
+function daemonSocketPath(): string {
+  const runtimeDir =
+    process.env.XDG_RUNTIME_DIR || path.join(process.env.HOME || "", ".cache", "ghg");
+  return path.join(runtimeDir, "ghg.sock");
+}
+
+function readLine(socket: net.Socket): Promise<string> {
+  return new Promise((resolve, reject) => {
+    const chunks: Buffer[] = [];
+    const onData = (chunk: Buffer) => {
+      const newline = chunk.indexOf(0x0a);
+      if (newline < 0) {
+        chunks.push(chunk);
+        return;
+      }
+      chunks.push(chunk.subarray(0, newline));
+      socket.off("data", onData);
+      resolve(Buffer.concat(chunks).toString("utf8"));
+    };
+    socket.on("data", onData);
+    socket.on("error", reject);
+    socket.once("end", () => reject(new Error("connection closed")));
+  });
+}
+
+export function requestDaemon(
+  socketPath: string,
+  request: ScanRequest,
+  replyTimeoutMs = DAEMON_REPLY_TIMEOUT_MS
+): Promise<ScanReport | null> {
+  if (!fs.existsSync(socketPath)) {
+    return Promise.resolve(null);
+  }
+  return new Promise((resolve) => {
+    const socket = net.createConnection(socketPath);
+    socket.setTimeout(DAEMON_CONNECT_TIMEOUT_MS);
+    socket.on("timeout", () => {
+      socket.destroy();
+      resolve(null);
+    });
+    socket.on("error", () => resolve(null));
+    socket.once("connect", () => {
+      socket.setTimeout(replyTimeoutMs);
+      socket.write(`${JSON.stringify(request)}\n`);
+      readLine(socket)
+        .then((line) => JSON.parse(line) as ScanReport)
+        .then(resolve, () => resolve(null))
+        .finally(() => socket.end());
+    });
+  });
+}
+
+function daemonRunning(socketPath: string): Promise<boolean> {
+  return new Promise((resolve) => {
+    const socket = net.createConnection(socketPath);
+    socket.once("connect", () => {
+      socket.end();
+      resolve(true);
+    });
+    socket.once("error", () => resolve(false));
+  });
+}
+
+export function scheduleRefresh(
+  watched: Map<string, ScanRequest>,
+  intervalMs: number,
+  refresh: (requests: ScanRequest[]) => void
+): NodeJS.Timeout {
+  return setInterval(() => {
+    refresh([...watched.values()].map((request) => ({ ...request, refresh: true })));
+  }, intervalMs);
+}
+
+export async function startDaemon(socketPath: string): Promise<net.Server> {
+  const cache = loadRepoCache();
+  const spinner = createSpinner(false);
+  const watched = new Map<string, ScanRequest>();
+  const revalidating = new Set<string>();
+  const revalidate = (request: ScanRequest) => {
+    const key = `${request.recursive}:${request.root}`;
+    if (revalidating.has(key)) {
+      return;
+    }
+    revalidating.add(key);
+    scanRepos(request, cache, true, spinner)
+      .catch(() => undefined)
+      .finally(() => revalidating.delete(key));
+  };
+
+  const server = net.createServer((socket) => {
+    socket.on("error", () => socket.destroy());
+    readLine(socket)
+      .then(async (line) => {
+        const request = JSON.parse(line) as ScanRequest;
+        const watchedRequest: ScanRequest = {
+          root: request.root,
+          recursive: request.recursive,
+          refresh: false,
+        };
+        watched.set(`${request.recursive}:${request.root}`, watchedRequest);
+        const heartbeat = setInterval(() => socket.write(" "), DAEMON_HEARTBEAT_MS);
+        let report: ScanReport;
+        try {
+          report = await scanRepos(request, cache, true, spinner, Infinity);
+        } finally {
+          clearInterval(heartbeat);
+        }
+        socket.end(`${JSON.stringify(report)}\n`);
+        revalidate({ ...watchedRequest, token: request.token });
+      })
+      .catch(() => socket.destroy());
+  });
+
+  await new Promise<void>((resolve, reject) => {
+    server.once("error", reject);
+    server.listen(socketPath, resolve);
+  });
+  const refreshIntervalMs = Math.max(cacheTtlMs(), 30 * 1000);
+  const refreshTimer = scheduleRefresh(watched, refreshIntervalMs, (requests) => {
+    githubToken(true);
+    requests.forEach(revalidate);
+  });
+  server.on("close", () => clearInterval(refreshTimer));
+  return server;
+}
+
+async function runDaemon(): Promise<number> {
+  const socketPath = daemonSocketPath();
+  if (await daemonRunning(socketPath)) {
+    console.error(`ghg daemon already running: ${socketPath}`);
+    return 1;
+  }
+  fs.mkdirSync(path.dirname(socketPath), { recursive: true });
+  fs.rmSync(socketPath, { force: true });
+
+  const server = await startDaemon(socketPath);
+  console.error(`ghg daemon listening on ${socketPath}`);
+
+  await new Promise<void>((resolve) => {
+    const shutdown = () => {
+      server.close();
+      fs.rmSync(socketPath, { force: true });
+      resolve();
+    };
+    process.once("SIGINT", shutdown);
+    process.once("SIGTERM", shutdown);
+  });
+  return 0;
+}
+
 export async function main(): Promise<number> {
   const args = parseArgs(process.argv);
   if (args.help) {
     printHelp();
     return 0;
   }
+  if (args.daemon) {
+    return runDaemon();
+  }
 
   const configRoot = loadConfigRoot();
   const rootValue = args.root !== "." ? args.root : configRoot || ".";
@@ -584,146 +1050,33 @@ export async function main(): Promise<number> {
     return 1;
   }
 
-  const useGh = ghAvailable();
-  const token = githubToken();
-  if (!useGh && !token) {
-    console.error(
-      "Warning: GITHUB_TOKEN/GH_TOKEN not set; GitHub API rate limits apply."
-    );
+  const request: ScanRequest = { root, recursive: args.recursive, refresh: args.refresh };
+  const envToken = process.env.GITHUB_TOKEN || process.env.GH_TOKEN;
+  let report =
+    args.noCache || args.refresh
+      ? null
+      : await requestDaemon(daemonSocketPath(), { ...request, token: envToken });
+  if (!report) {
+    const cache: RepoCache = args.noCache ? {} : loadRepoCache();
+    report = await scanRepos(request, cache, !args.noCache, createSpinner(process.stderr.isTTY));
   }
-
-  const repos = findRepos(root, args.recursive).sort();
-  if (!repos.length) {
+  if (!report.repoCount) {
     console.log(`No git repositories found under ${root}`);
     return 0;
   }
-
-  const useColor = process.stdout.isTTY && !args.noColor;
-  const colors = useColor
-    ? {
-        reset: "\x1b[0m",
-        bold: "\x1b[1m",
-        white: "\x1b[37m",
-        cyan: "\x1b[36m",
-        red: "\x1b[31m",
-        yellow: "\x1b[33m",
-        darkMagenta: "\x1b[35m",
-        brightRed: "\x1b[91m",
-      }
-    : {
-        reset: "",
-        bold: "",
-        white: "",
-        cyan: "",
-        red: "",
-        yellow: "",
-        darkMagenta: "",
-        brightRed: "",
-      };
-
-  const results: RepoResult[] = [];
-  const spinner = createSpinner(process.stderr.isTTY);
-  spinner.start(`Scanning ${repos.length} repositories`);
-  for (let i = 0; i < repos.length; i += 1) {
-    const repoPath = repos[i];
-    const remote = runGit(["config", "--get", "remote.origin.url"], repoPath);
-    const info = parseGithubOwnerRepo(remote);
-    if (!info) {
-      continue;
-    }
-    spinner.update(`Fetching ${i + 1}/${repos.length}: ${info.owner}/${info.name}`);
-    try {
-      const repoInfo = useGh
-        ? await ghGraphqlRepoInfo(info.owner, info.name)
-        : await graphqlRepoInfo(info.owner, info.name, token || "").catch(
-            async () => {
-              if (!token) {
-                throw new Error("GITHUB_TOKEN/GH_TOKEN is required without gh");
-              }
-              return restRepoInfo(info.owner, info.name, token);
-            }
-          );
-      results.push({
-        repo: `${info.owner}/${info.name}`,
-        activity: repoInfo.activity,
-        issues: repoInfo.issues,
-        prs: repoInfo.prs,
-        stars: repoInfo.stars,
-        releaseTag: repoInfo.releaseTag,
-        releaseDate: repoInfo.releaseDate,
-      });
-    } catch (err) {
-      spinner.pauseFor(() => {
-        const message = err instanceof Error ? err.message : String(err);
-        console.error(`  Error: ${message}`);
-      });
-    }
+  for (const error of report.errors) {
+    console.error(`  Error: ${error}`);
   }
-  spinner.stop();
 
-  if (!results.length) {
+  if (!report.results.length) {
     return 0;
   }
 
-  const widths = {
-    activity: Math.max(
-      "ACTIVITY".length,
-      ...results.map((item) => item.activity.length)
-    ),
-    issues: Math.max(
-      "ISSUES".length,
-      ...results.map((item) => String(item.issues).length)
-    ),
-    prs: Math.max(
-      "PR".length,
-      ...results.map((item) => String(item.prs).length)
-    ),
-    stars: Math.max(
-      "STAR".length,
-      ...results.map((item) => String(item.stars).length)
-    ),
-    rel: Math.max(
-      "REL".length,
-      ...results.map((item) => item.releaseTag.length)
-    ),
-    released: Math.max(
-      "RELEASED".length,
-      ...results.map((item) => item.releaseDate.length)
-    ),
-    repo: Math.max("REPO".length, ...results.map((item) => item.repo.length)),
-  };
-
-  const header =
-    `${colors.bold}${colors.white}` +
-    `${"ACTIVITY".padEnd(widths.activity)}  ` +
-    `${"ISSUES".padStart(widths.issues)}  ` +
-    `${"PR".padStart(widths.prs)}  ` +
-    `${"STAR".padStart(widths.stars)}  ` +
-    `${"REL".padEnd(widths.rel)}  ` +
-    `${"RELEASED".padEnd(widths.released)}  ` +
-    `${"REPO".padEnd(widths.repo)}` +
-    `${colors.reset}`;
-  console.log(header);
-
-  for (const item of results) {
-    const zeroColor = colors.darkMagenta;
-    const issuesColor = item.issues > 0 ? colors.red : zeroColor;
-    const prsColor = item.prs > 0 ? colors.brightRed : zeroColor;
-    const starsColor = item.stars > 0 ? colors.yellow : zeroColor;
-    const relColor = item.releaseTag !== "-" ? colors.white : zeroColor;
-    const releasedColor = item.releaseDate !== "-" ? colors.white : zeroColor;
-
-    const line =
-      `${colors.darkMagenta}${item.activity.padEnd(widths.activity)}${colors.reset}  ` +
-      `${issuesColor}${String(item.issues).padStart(widths.issues)}${colors.reset}  ` +
-      `${prsColor}${String(item.prs).padStart(widths.prs)}${colors.reset}  ` +
-      `${starsColor}${String(item.stars).padStart(widths.stars)}${colors.reset}  ` +
-      `${relColor}${item.releaseTag.padEnd(widths.rel)}${colors.reset}  ` +
-      `${releasedColor}${item.releaseDate.padEnd(widths.released)}${colors.reset}  ` +
-      `${colors.cyan}${item.repo.padEnd(widths.repo)}${colors.reset}`;
-    console.log(line);
-  }
-
+  const useColor = Boolean(process.stdout.isTTY) && !args.noColor;
+  const table = renderTable(report.results, useColor);
+  await new Promise<void>((resolve) => {
+    process.stdout.write(table, () => resolve());
+  });
   return 0;
 }
 
@@ -1,13 +1,77 @@
+import { execFileSync } from "child_process";
 import fs from "fs";
+import http from "http";
+import net from "net";
+import type { AddressInfo } from "net";
 import os from "os";
 import path from "path";
 import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
 import {
+  buildRepoInfoQuery,
+  cacheTtlMs,
+  fetchRepoInfos,
+  findRepos,
   formatRelativeTime,
   loadConfigRoot,
-  parseGithubOwnerRepo
+  loadRepoCache,
+  main,
+  parseGithubOwnerRepo,
+  readRemoteOriginUrl,
+  renderTable,
+  requestDaemon,
+  requestJson,
+  saveRepoCache,
+  scheduleRefresh,
+  staleTargets,
+  startDaemon
 } from "../src/ghg";
 
+const repoInfo = {
+  activityAt: "2024-12-31T00:00:00Z",
+  issues: 1,
+  prs: 2,
+  stars: 3,
+  releaseTag: "v1.0.0",
+  releaseDate: "2024-12-01"
+};
+
+async function localTransport(server: http.Server) {
+  await new Promise<void>((resolve) => server.listen(0, "127.0.0.1", resolve));
+  const { port } = server.address() as AddressInfo;
+  return (options: http.RequestOptions, callback: (res: http.IncomingMessage) => void) =>
+    http.request({ ...options, host: "127.0.0.1", port }, callback);
+}
+
+async function runMain(argv: string[]): Promise<{ code: number; stdout: string; stderr: string }> {
+  const originalArgv = process.argv;
+  const originalWrite = process.stdout.write;
+  const originalLog = console.log;
+  const originalError = console.error;
+  let stdout = "";
+  let stderr = "";
+  process.argv = ["node", "ghg", ...argv];
+  process.stdout.write = ((chunk: string, callback?: () => void) => {
+    stdout += chunk;
+    callback?.();
+    return true;
+  }) as typeof process.stdout.write;
+  console.log = (message: string) => {
+    stdout += `${message}\n`;
+  };
+  console.error = (message: string) => {
+    stderr += `${message}\n`;
+  };
+  try {
+    const code = await main();
+    return { code, stdout, stderr };
+  } finally {
+    process.argv = originalArgv;
+    process.stdout.write = originalWrite;
+    console.log = originalLog;
+    console.error = originalError;
+  }
+}
+
 describe("parseGithubOwnerRepo", () => {
   it("parses git@github.com remotes", () => {
     expect(parseGithubOwnerRepo("git@github.com:owner/repo.git")).toEqual({
@@ -28,6 +92,225 @@ describe("parseGithubOwnerRepo", () => {
   });
 });
 
+describe("readRemoteOriginUrl", () => {
+  const gitConfig = [
+    "[core]",
+    "\tbare = false",
+    '[remote "upstream"]',
+    "\turl = https://github.com/upstream/repo.git",
+    '[remote "origin"]',
+    "\turl = git@github.com:owner/repo.git",
+    "\tfetch = +refs/heads/*:refs/remotes/origin/*",
+    ""
+  ].join("\n");
+
+  it("reads the origin url from .git/config", async () => {
+    const repo = fs.mkdtempSync(path.join(os.tmpdir(), "ghg-"));
+    fs.mkdirSync(path.join(repo, ".git"));
+    fs.writeFileSync(path.join(repo, ".git", "config"), gitConfig, "utf8");
+    expect(await readRemoteOriginUrl(repo)).toBe("git@github.com:owner/repo.git");
+  });
+
+  it("follows gitfiles to the common git directory", async () => {
+    const tempDir = fs.mkdtempSync(path.join(os.tmpdir(), "ghg-"));
+    const worktreeGitDir = path.join(tempDir, "main", ".git", "worktrees", "feature");
+    fs.mkdirSync(worktreeGitDir, { recursive: true });
+    fs.writeFileSync(path.join(tempDir, "main", ".git", "config"), gitConfig, "utf8");
+    fs.writeFileSync(path.join(worktreeGitDir, "commondir"), "../..\n", "utf8");
+    const worktree = path.join(tempDir, "feature");
+    fs.mkdirSync(worktree);
+    fs.writeFileSync(path.join(worktree, ".git"), `gitdir: ${worktreeGitDir}\n`, "utf8");
+    expect(await readRemoteOriginUrl(worktree)).toBe("git@github.com:owner/repo.git");
+  });
+
+  it("matches the section name case-insensitively but not the subsection", async () => {
+    const repo = fs.mkdtempSync(path.join(os.tmpdir(), "ghg-"));
+    fs.mkdirSync(path.join(repo, ".git"));
+    const configFile = path.join(repo, ".git", "config");
+    fs.writeFileSync(configFile, '[Remote "origin"]\n\turl = git@github.com:owner/repo.git\n', "utf8");
+    expect(await readRemoteOriginUrl(repo)).toBe("git@github.com:owner/repo.git");
+    fs.writeFileSync(configFile, '[remote "Origin"]\n\turl = git@github.com:owner/repo.git\n', "utf8");
+    expect(await readRemoteOriginUrl(repo)).toBeNull();
+  });
+
+  describe("git fallback", () => {
+    const originalPath = process.env.PATH;
+    let repo = "";
+    let marker = "";
+
+    beforeEach(() => {
+      const tempDir = fs.mkdtempSync(path.join(os.tmpdir(), "ghg-"));
+      const bin = path.join(tempDir, "bin");
+      marker = path.join(tempDir, "git-called");
+      fs.mkdirSync(bin);
+      fs.writeFileSync(
+        path.join(bin, "git"),
+        `#!/bin/sh\n: > "${marker}"\necho git@github.com:included/repo.git\n`,
+        { mode: 0o755 }
+      );
+      process.env.PATH = bin;
+      repo = path.join(tempDir, "repo");
+      fs.mkdirSync(path.join(repo, ".git"), { recursive: true });
+    });
+
+    afterEach(() => {
+      process.env.PATH = originalPath;
+    });
+
+    it("does not run git when the config has no origin", async () => {
+      fs.writeFileSync(path.join(repo, ".git", "config"), "[core]\n\tbare = false\n", "utf8");
+      expect(await readRemoteOriginUrl(repo)).toBeNull();
+      expect(fs.existsSync(marker)).toBe(false);
+    });
+
+    it("asks git when the config includes other files", async () => {
+      fs.writeFileSync(
+        path.join(repo, ".git", "config"),
+        '[includeIf "gitdir:~/work/"]\n\tpath = ~/.gitconfig-work\n',
+        "utf8"
+      );
+      expect(await readRemoteOriginUrl(repo)).toBe("git@github.com:included/repo.git");
+      expect(fs.existsSync(marker)).toBe(true);
+    });
+  });
+});
+
+describe("findRepos", () => {
+  let root = "";
+
+  beforeEach(() => {
+    root = fs.mkdtempSync(path.join(os.tmpdir(), "ghg-"));
+    const mkdir = (...parts: string[]) =>
+      fs.mkdirSync(path.join(root, ...parts), { recursive: true });
+    mkdir("top", ".git");
+    mkdir("top", "vendor", "inner", ".git");
+    mkdir("group", "nested", ".git");
+    mkdir("ignored", ".git");
+    fs.writeFileSync(path.join(root, "ignored", ".nogit"), "", "utf8");
+    mkdir("archive", "old", ".git");
+    fs.writeFileSync(path.join(root, "archive", ".nogit"), "", "utf8");
+    mkdir("worktree");
+    fs.writeFileSync(path.join(root, "worktree", ".git"), "gitdir: ../top/.git\n", "utf8");
+  });
+
+  const relative = (repos: string[]) => repos.map((repo) => path.relative(root, repo)).sort();
+
+  it("finds top-level repositories", async () => {
+    expect(relative(await findRepos(root, false))).toEqual(["top", "worktree"]);
+  });
+
+  it("finds nested repositories only when recursive", async () => {
+    expect(relative(await findRepos(root, true))).toEqual([
+      path.join("group", "nested"),
+      "top",
+      "worktree"
+    ]);
+  });
+});
+
+describe("buildRepoInfoQuery", () => {
+  it("aliases one repository field per repo", () => {
+    const { query, variables } = buildRepoInfoQuery([
+      { owner: "foo", name: "bar" },
+      { owner: "baz", name: "qux" }
+    ]);
+    expect(query).toContain("r0: repository(owner:$owner0, name:$name0) { ...RepoInfo }");
+    expect(query).toContain("r1: repository(owner:$owner1, name:$name1) { ...RepoInfo }");
+    expect(query).toContain("fragment RepoInfo on Repository");
+    expect(variables).toEqual({ owner0: "foo", name0: "bar", owner1: "baz", name1: "qux" });
+  });
+});
+
+describe("fetchRepoInfos", () => {
+  const repos = [
+    { owner: "foo", name: "bar" },
+    { owner: "foo", name: "missing" }
+  ];
+  const graphqlRepo = {
+    stargazerCount: 3,
+    pushedAt: "2024-12-31T00:00:00Z",
+    issues: { totalCount: 1 },
+    pullRequests: { totalCount: 2 },
+    latestRelease: { tagName: "v1.0.0", createdAt: "2024-12-01T10:00:00Z" }
+  };
+
+  it("maps aliased repositories and per-alias errors", async () => {
+    const paths: string[] = [];
+    const server = http.createServer((req, res) => {
+      paths.push(req.url || "");
+      res.end(
+        JSON.stringify({
+          data: { r0: graphqlRepo, r1: null },
+          errors: [{ message: "Could not resolve to a Repository", path: ["r1"] }]
+        })
+      );
+    });
+    const transport = await localTransport(server);
+    try {
+      const [found, missing] = await fetchRepoInfos(repos, "token", () => ({}), transport);
+      expect(found).toEqual(repoInfo);
+      expect((missing as Error).message).toBe("Could not resolve to a Repository");
+      expect(paths).toEqual(["/graphql"]);
+    } finally {
+      server.close();
+    }
+  });
+
+  it("falls back to REST when GraphQL returns no data", async () => {
+    const paths: string[] = [];
+    const server = http.createServer((req, res) => {
+      const url = req.url || "";
+      paths.push(url);
+      if (url === "/graphql") {
+        res.end(JSON.stringify({ data: null, errors: [{ message: "Something went wrong" }] }));
+      } else if (url.startsWith("/search/issues")) {
+        res.end(JSON.stringify({ total_count: url.includes("type%3Apr") ? 2 : 1 }));
+      } else if (url === "/repos/foo/bar") {
+        res.end(JSON.stringify({ pushed_at: "2024-12-31T00:00:00Z", stargazers_count: 3 }));
+      } else if (url === "/repos/foo/bar/releases/latest") {
+        res.end(JSON.stringify({ tag_name: "v1.0.0", created_at: "2024-12-01T10:00:00Z" }));
+      } else {
+        res.statusCode = 404;
+        res.end();
+      }
+    });
+    const transport = await localTransport(server);
+    try {
+      const [found, missing] = await fetchRepoInfos(repos, "token", () => ({}), transport);
+      expect(found).toEqual(repoInfo);
+      expect((missing as Error).message).toBe("repository not found or access denied");
+      expect(paths[0]).toBe("/graphql");
+      expect(paths).toContain("/repos/foo/missing");
+    } finally {
+      server.close();
+    }
+  });
+});
+
+describe("renderTable", () => {
+  it("pads columns to the widest cell", () => {
+    const table = renderTable(
+      [
+        {
+          repo: "owner/repo",
+          activity: "2 days ago",
+          activityAt: "2024-12-30T00:00:00Z",
+          issues: 12,
+          prs: 0,
+          stars: 345,
+          releaseTag: "v1.2.3",
+          releaseDate: "2024-12-01"
+        }
+      ],
+      false
+    );
+    expect(table).toBe(
+      "ACTIVITY    ISSUES  PR  STAR  REL     RELEASED    REPO      \n" +
+        "2 days ago      12   0   345  v1.2.3  2024-12-01  owner/repo\n"
+    );
+  });
+});
+
 describe("formatRelativeTime", () => {
   beforeEach(() => {
     vi.useFakeTimers();
@@ -50,6 +333,12 @@ describe("formatRelativeTime", () => {
     expect(formatRelativeTime("2024-12-30T00:00:00Z")).toBe("2 days ago");
   });
 
+  it("formats relative to an explicit time", () => {
+    const now = Date.parse("2025-03-01T00:00:00Z");
+    expect(formatRelativeTime("2025-01-01T00:00:00Z", now)).toBe("1 mo ago");
+    expect(formatRelativeTime("2025-02-28T00:00:00Z", now)).toBe("1 day ago");
+  });
+
   it("handles missing values", () => {
     expect(formatRelativeTime(null)).toBe("-");
   });
@@ -79,3 +368,286 @@ describe("loadConfigRoot", () => {
     expect(loadConfigRoot()).toBe("/tmp/work");
   });
 });
+
+describe("repo cache", () => {
+  const originalHome = process.env.HOME;
+
+  afterEach(() => {
+    if (originalHome) {
+      process.env.HOME = originalHome;
+    } else {
+      delete process.env.HOME;
+    }
+  });
+
+  it("round-trips entries through the cache file", () => {
+    process.env.HOME = fs.mkdtempSync(path.join(os.tmpdir(), "ghg-"));
+    expect(loadRepoCache()).toEqual({});
+    const cache = {
+      "foo/bar": {
+        fetchedAt: 1735689600000,
+        data: {
+          activityAt: "2024-12-31T00:00:00Z",
+          issues: 1,
+          prs: 2,
+          stars: 3,
+          releaseTag: "v1.0.0",
+          releaseDate: "2024-12-01"
+        }
+      }
+    };
+    saveRepoCache(cache);
+    expect(loadRepoCache()).toEqual(cache);
+  });
+});
+
+describe("staleTargets", () => {
+  const now = Date.parse("2025-01-01T00:00:00Z");
+  const targets = [
+    { owner: "foo", name: "fresh" },
+    { owner: "foo", name: "old" },
+    { owner: "foo", name: "missing" },
+    { owner: "foo", name: "fresh" }
+  ];
+  const cache = {
+    "foo/fresh": { fetchedAt: now - 60 * 1000, data: repoInfo },
+    "foo/old": { fetchedAt: now - 600 * 1000, data: repoInfo }
+  };
+
+  it("skips entries younger than the ttl", () => {
+    expect(staleTargets(targets, cache, now, 300 * 1000, false)).toEqual([
+      { owner: "foo", name: "old" },
+      { owner: "foo", name: "missing" }
+    ]);
+  });
+
+  it("refetches every repository once with refresh", () => {
+    expect(staleTargets(targets, cache, now, 300 * 1000, true)).toEqual([
+      { owner: "foo", name: "fresh" },
+      { owner: "foo", name: "old" },
+      { owner: "foo", name: "missing" }
+    ]);
+  });
+});
+
+describe("cacheTtlMs", () => {
+  const originalTtl = process.env.GHG_TTL;
+
+  afterEach(() => {
+    if (originalTtl === undefined) {
+      delete process.env.GHG_TTL;
+    } else {
+      process.env.GHG_TTL = originalTtl;
+    }
+  });
+
+  it("reads GHG_TTL in seconds", () => {
+    process.env.GHG_TTL = "60";
+    expect(cacheTtlMs()).toBe(60 * 1000);
+  });
+
+  it("falls back to 300 seconds for invalid values", () => {
+    for (const value of ["", "abc", "-1"]) {
+      process.env.GHG_TTL = value;
+      expect(cacheTtlMs()).toBe(300 * 1000);
+    }
+  });
+});
+
+describe("main cache handling", () => {
+  const keys = ["HOME", "XDG_RUNTIME_DIR", "PATH", "GITHUB_TOKEN", "GH_TOKEN", "GHG_TTL"];
+  const originalEnv = Object.fromEntries(keys.map((key) => [key, process.env[key]]));
+  let root = "";
+  let cacheFile = "";
+
+  beforeEach(() => {
+    const home = fs.mkdtempSync(path.join(os.tmpdir(), "ghg-"));
+    process.env.HOME = home;
+    process.env.XDG_RUNTIME_DIR = home;
+    const bin = path.join(home, "bin");
+    fs.mkdirSync(bin);
+    fs.writeFileSync(path.join(bin, "gh"), "#!/bin/sh\nexit 1\n", { mode: 0o755 });
+    process.env.PATH = `${bin}${path.delimiter}${originalEnv.PATH}`;
+    delete process.env.GITHUB_TOKEN;
+    delete process.env.GH_TOKEN;
+    delete process.env.GHG_TTL;
+    root = path.join(home, "work");
+    execFileSync("git", ["init", "-q", path.join(root, "bar")]);
+    fs.appendFileSync(
+      path.join(root, "bar", ".git", "config"),
+      '[remote "origin"]\n\turl = git@github.com:foo/bar.git\n',
+      "utf8"
+    );
+    saveRepoCache({ "foo/bar": { fetchedAt: Date.now(), data: repoInfo } });
+    cacheFile = path.join(home, ".cache", "ghg", "repos.json");
+  });
+
+  afterEach(() => {
+    for (const key of keys) {
+      if (originalEnv[key] === undefined) {
+        delete process.env[key];
+      } else {
+        process.env[key] = originalEnv[key];
+      }
+    }
+  });
+
+  it("serves fresh entries from the cache without fetching", async () => {
+    const { code, stdout, stderr } = await runMain(["--root", root, "--no-color"]);
+    expect(code).toBe(0);
+    expect(stdout).toContain("foo/bar");
+    expect(stderr).toBe("");
+  });
+
+  it("neither reads nor writes the cache with --no-cache", async () => {
+    const before = fs.readFileSync(cacheFile, "utf8");
+    const { code, stdout, stderr } = await runMain(["--root", root, "--no-color", "--no-cache"]);
+    expect(code).toBe(0);
+    expect(stdout).not.toContain("foo/bar");
+    expect(stderr).toBe("  Error: GITHUB_TOKEN/GH_TOKEN not set and `gh auth token` failed\n");
+    expect(fs.readFileSync(cacheFile, "utf8")).toBe(before);
+  });
+
+  it("answers from a running daemon's cache without waiting for a refetch", async () => {
+    saveRepoCache({ "foo/bar": { fetchedAt: 0, data: repoInfo } });
+    const server = await startDaemon(path.join(process.env.XDG_RUNTIME_DIR || "", "ghg.sock"));
+    try {
+      const { code, stdout, stderr } = await runMain(["--root", root, "--no-color"]);
+      expect(code).toBe(0);
+      expect(stdout).toContain("foo/bar");
+      expect(stderr).toBe("");
+    } finally {
+      server.close();
+    }
+  });
+});
+
+describe("requestJson", () => {
+  it("revalidates cached responses with ETags", async () => {
+    const seen: Array<string | undefined> = [];
+    const server = http.createServer((req, res) => {
+      seen.push(req.headers["if-none-match"]);
+      if (req.url === "/gone") {
+        res.statusCode = 404;
+        res.end();
+      } else if (req.headers["if-none-match"] === '"v1"') {
+        res.statusCode = 304;
+        res.end();
+      } else {
+        res.setHeader("ETag", '"v1"');
+        res.end(JSON.stringify({ value: 1 }));
+      }
+    });
+    const transport = await localTransport(server);
+    const get = (requestPath: string) =>
+      requestJson({ path: requestPath }, undefined, responses, transport);
+    const responses: Record<string, { etag: string; body: unknown }> = {};
+    try {
+      expect(await get("/repo")).toEqual({ value: 1 });
+      expect(responses["/repo"]).toEqual({ etag: '"v1"', body: { value: 1 } });
+      expect(await get("/repo")).toEqual({ value: 1 });
+      expect(seen).toEqual([undefined, '"v1"']);
+
+      responses["/gone"] = { etag: '"old"', body: { value: 0 } };
+      expect(await get("/gone")).toBeNull();
+      expect(responses["/gone"]).toBeUndefined();
+    } finally {
+      server.close();
+    }
+  });
+});
+
+describe("scheduleRefresh", () => {
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it("refetches every watched root on each tick", () => {
+    vi.useFakeTimers();
+    const watched = new Map([["false:/work", { root: "/work", recursive: false, refresh: false }]]);
+    const ticks: unknown[] = [];
+    const timer = scheduleRefresh(watched, 1000, (requests) => ticks.push(requests));
+    try {
+      vi.advanceTimersByTime(999);
+      expect(ticks).toEqual([]);
+      vi.advanceTimersByTime(1);
+      expect(ticks).toEqual([[{ root: "/work", recursive: false, refresh: true }]]);
+      watched.set("true:/src", { root: "/src", recursive: true, refresh: false });
+      vi.advanceTimersByTime(1000);
+      expect(ticks[1]).toEqual([
+        { root: "/work", recursive: false, refresh: true },
+        { root: "/src", recursive: true, refresh: true }
+      ]);
+    } finally {
+      clearInterval(timer);
+    }
+  });
+});
+
+describe("requestDaemon", () => {
+  const request = { root: "/tmp/work", recursive: false, refresh: false };
+  let socketPath = "";
+
+  beforeEach(() => {
+    socketPath = path.join(fs.mkdtempSync(path.join(os.tmpdir(), "ghg-")), "ghg.sock");
+  });
+
+  const listen = async (onConnection: (socket: net.Socket) => void) => {
+    const server = net.createServer(onConnection);
+    await new Promise<void>((resolve) => server.listen(socketPath, resolve));
+    return server;
+  };
+
+  it("round-trips a scan report", async () => {
+    const report = { repoCount: 1, results: [], errors: ["foo/bar: boom"] };
+    let received = "";
+    const server = await listen((socket) => {
+      socket.on("data", (chunk) => {
+        received += chunk.toString();
+        if (received.includes("\n")) {
+          socket.end(`${JSON.stringify(report)}\n`);
+        }
+      });
+    });
+    try {
+      expect(await requestDaemon(socketPath, request)).toEqual(report);
+      expect(JSON.parse(received)).toEqual(request);
+    } finally {
+      server.close();
+    }
+  });
+
+  it("returns null when nothing listens on the socket path", async () => {
+    fs.writeFileSync(socketPath, "", "utf8");
+    expect(await requestDaemon(socketPath, request)).toBeNull();
+  });
+
+  it("keeps waiting while the daemon sends heartbeats", async () => {
+    const report = { repoCount: 0, results: [], errors: [] };
+    const server = await listen((socket) => {
+      const heartbeat = setInterval(() => socket.write(" "), 20);
+      setTimeout(() => {
+        clearInterval(heartbeat);
+        socket.end(`${JSON.stringify(report)}\n`);
+      }, 300);
+    });
+    try {
+      expect(await requestDaemon(socketPath, request, 100)).toEqual(report);
+    } finally {
+      server.close();
+    }
+  });
+
+  it("returns null when the daemon never replies", async () => {
+    const sockets: net.Socket[] = [];
+    const server = await listen((socket) => {
+      sockets.push(socket);
+    });
+    try {
+      expect(await requestDaemon(socketPath, request, 100)).toBeNull();
+    } finally {
+      sockets.forEach((socket) => socket.destroy());
+      server.close();
+    }
+  });
+});